@@ -4,6 +4,8 @@ API client for enriching media metadata.
 from typing import Dict, Any, Optional, List
 import requests
 import logging
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from ..config.settings import (
     TMDB_API_KEY,
     DISCOGS_CONSUMER_KEY,
@@ -12,6 +14,21 @@ from ..config.settings import (
 
 logger = logging.getLogger(__name__)
 
+def create_session() -> requests.Session:
+    """Create an HTTP session for metadata lookups.
+    
+    The owner keeps it for its lifetime so TMDB/Discogs connections stay
+    alive between lookups instead of paying a fresh TCP + TLS handshake
+    per request, and closes it when done.
+    """
+    session = requests.Session()
+    session.mount('https://', HTTPAdapter(
+        pool_connections=10,
+        pool_maxsize=10,
+        max_retries=Retry(total=3, backoff_factor=0.3)
+    ))
+    return session
+
 class TMDbClient:
     """Client for interacting with The Movie Database (TMDb) API."""
     
@@ -109,12 +126,13 @@ def create_empty_audio_result() -> Dict[str, Any]:
         'tracks': []
     }
 
-def search_movie_details(text: str) -> Dict[str, Any]:
+def search_movie_details(text: str, session: Optional[requests.Session] = None) -> Dict[str, Any]:
     """
     Search for movie details using TMDB API.
     
     Args:
         text: Extracted text from media cover
+        session: Optional HTTP session to reuse connections from
         
     Returns:
         Dictionary of movie details (empty if no API key or error)
@@ -126,12 +144,14 @@ def search_movie_details(text: str) -> Dict[str, Any]:
         logger.warning("No TMDB API key configured")
         return results
         
+    http = session or requests
+        
     try:
         # Extract potential title from first few lines
         potential_title = text.split('\n')[0].strip()
         
         # Search TMDB
-        response = requests.get(
+        response = http.get(
             'https://api.themoviedb.org/3/search/movie',
             params={
                 'api_key': TMDB_API_KEY,
@@ -149,7 +169,7 @@ def search_movie_details(text: str) -> Dict[str, Any]:
                 
                 # Get additional details
                 movie_id = movie['id']
-                details = requests.get(
+                details = http.get(
                     f'https://api.themoviedb.org/3/movie/{movie_id}',
                     params={
                         'api_key': TMDB_API_KEY,
@@ -188,13 +208,18 @@ def search_movie_details(text: str) -> Dict[str, Any]:
         
     return results
 
-def search_audio_details(text: str, media_type: str) -> Dict[str, Any]:
+def search_audio_details(
+    text: str,
+    media_type: str,
+    session: Optional[requests.Session] = None
+) -> Dict[str, Any]:
     """
     Search for audio media details using Discogs API.
     
     Args:
         text: Extracted text from media cover
         media_type: Type of audio media (CD, VINYL, CASSETTE)
+        session: Optional HTTP session to reuse connections from
         
     Returns:
         Dictionary of audio details (empty if no API key or error)
@@ -205,6 +230,8 @@ def search_audio_details(text: str, media_type: str) -> Dict[str, Any]:
         logger.warning("No Discogs API credentials configured")
         return results
         
+    http = session or requests
+        
     try:
         # Extract potential artist/album from first few lines
         lines = [line.strip() for line in text.split('\n') if line.strip()]
@@ -219,7 +246,7 @@ def search_audio_details(text: str, media_type: str) -> Dict[str, Any]:
             }
             
             # Search Discogs
-            response = requests.get(
+            response = http.get(
                 'https://api.discogs.com/database/search',
                 params={
                     'artist': potential_artist,
@@ -236,7 +263,7 @@ def search_audio_details(text: str, media_type: str) -> Dict[str, Any]:
                     
                     # Get detailed release info
                     release_id = release['id']
-                    details = requests.get(
+                    details = http.get(
                         f'https://api.discogs.com/releases/{release_id}',
                         headers=headers
                     ).json()
@@ -9,7 +9,7 @@ import cv2
 import numpy as np
 import pytesseract
 from src.vision.processor import extract_text_from_image, preprocess_image
-from src.enrichment.api_client import search_movie_details
+from src.enrichment.api_client import create_session, search_movie_details
 
 class MediaType(Enum):
     """Available media types."""
@@ -37,6 +37,28 @@ class MediaProcessor:
         self.image: Optional[np.ndarray] = None
         self.image_path: Optional[Path] = None
         self.metadata = MediaMetadata()
+        # HTTP session for metadata lookups, created by the processors that
+        # make them; released by close()
+        self._session = None
+        
+    @property
+    def session(self):
+        """Pooled HTTP session, created on first use."""
+        if self._session is None:
+            self._session = create_session()
+        return self._session
+        
+    def close(self):
+        """Release pooled HTTP connections, if any were opened."""
+        if self._session is not None:
+            self._session.close()
+            self._session = None
+            
+    def __enter__(self):
+        return self
+        
+    def __exit__(self, *exc_info):
+        self.close()
         
     def load_image(self, image_path: str | Path) -> bool:
         """Load image from path."""
@@ -104,7 +126,7 @@ class VHSProcessor(MediaProcessor):
             extracted_text = extract_text_from_image(processed_img)
             
             # Search for movie details
-            movie_details = search_movie_details(extracted_text)
+            movie_details = search_movie_details(extracted_text, session=self.session)
             
             # Update metadata
             self.metadata.title = movie_details.get('title')
@@ -141,7 +163,7 @@ class DVDProcessor(MediaProcessor):
             extracted_text = extract_text_from_image(processed_img)
             
             # Search for movie details - can reuse VHS movie lookup
-            movie_details = search_movie_details(extracted_text)
+            movie_details = search_movie_details(extracted_text, session=self.session)
             
             # DVD-specific metadata
             self.metadata.title = movie_details.get('title')
@@ -354,7 +376,11 @@ class CassetteProcessor(AudioMediaProcessor):
         return info
 
 def create_processor(media_type: str) -> MediaProcessor:
-    """Factory function to create appropriate processor."""
+    """Factory function to create appropriate processor.
+    
+    Use the result as a context manager (or call close()) so any HTTP
+    session opened for lookups is released.
+    """
     processors = {
         "VHS": VHSProcessor,
         "DVD": DVDProcessor,
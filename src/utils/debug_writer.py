@@ -0,0 +1,74 @@
+"""
+Background writer for debug images.
+"""
+import logging
+import queue
+import threading
+
+import cv2
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+class DebugImageWriter:
+    """Writes debug images on a daemon thread so processing never waits on disk."""
+
+    def __init__(self, max_pending: int = 64, name: str = "debug-writer"):
+        """
+        Start the writer thread.
+
+        Args:
+            max_pending: Queued images before new ones are dropped
+            name: Name of the writer thread
+        """
+        self._queue = queue.Queue(maxsize=max_pending)
+        self._closed = False
+        threading.Thread(target=self._run, name=name, daemon=True).start()
+
+    def submit(self, path: str, image: np.ndarray) -> bool:
+        """
+        Queue a snapshot of an image to be written to path.
+
+        Args:
+            path: Destination file path
+            image: Image array or cv2.UMat; copied so the caller may reuse it
+
+        Returns:
+            True if queued, False if the writer is closed or the queue is full
+        """
+        if self._closed:
+            return False
+        snapshot = image.get() if isinstance(image, cv2.UMat) else image.copy()
+        try:
+            self._queue.put_nowait((path, snapshot))
+            return True
+        except queue.Full:
+            logger.warning(f"Debug image queue full, dropping {path}")
+            return False
+
+    def flush(self):
+        """Block until every queued image has been written."""
+        self._queue.join()
+
+    def close(self):
+        """Stop the writer once pending images are saved."""
+        if not self._closed:
+            self._closed = True
+            self._queue.put(None)
+
+    def _run(self):
+        """Write queued images until the None sentinel arrives."""
+        while True:
+            item = self._queue.get()
+            try:
+                if item is None:
+                    return
+                path, image = item
+                if cv2.imwrite(path, image):
+                    logger.debug(f"Saved debug image: {path}")
+                else:
+                    logger.error(f"Failed to save debug image: {path}")
+            except Exception as e:
+                logger.error(f"Failed to save debug image: {e}")
+            finally:
+                self._queue.task_done()
@@ -10,18 +10,20 @@ import numpy as np
 
 logger = logging.getLogger(__name__)
 
-def load_image(path: str) -> Optional[np.ndarray]:
+def load_image(path: str, grayscale: bool = False) -> Optional[np.ndarray]:
     """
     Load image from path.
     
     Args:
         path: Path to image file
+        grayscale: Decode straight to one channel, skipping the color
+            conversion for callers that only need intensity
         
     Returns:
         Image array or None if loading fails
     """
     try:
-        image = cv2.imread(path)
+        image = cv2.imread(path, cv2.IMREAD_GRAYSCALE if grayscale else cv2.IMREAD_COLOR)
         if image is None:
             logger.error(f"Failed to load image: {path}")
             return None
@@ -151,19 +153,20 @@ def denoise_image(image: np.ndarray) -> np.ndarray:
         if image.dtype != np.uint8:
             image = cv2.convertScaleAbs(image)
             
-        # Calculate local noise levels using sliding window
+        # Calculate local noise levels (patch standard deviation) using
+        # box filters: std = sqrt(E[x^2] - E[x]^2) over each window
         patch_size = 7
-        noise_map = np.zeros_like(image, dtype=np.float32)
-        
-        # Pad image for window operations
-        padded = cv2.copyMakeBorder(image, patch_size//2, patch_size//2, patch_size//2, patch_size//2, cv2.BORDER_REFLECT)
-        
-        # Calculate local noise for each pixel
-        h, w = image.shape[:2]
-        for i in range(h):
-            for j in range(w):
-                patch = padded[i:i+patch_size, j:j+patch_size]
-                noise_map[i,j] = np.std(patch)
+        pixels = image.astype(np.float64)
+        local_mean = cv2.blur(pixels, (patch_size, patch_size), borderType=cv2.BORDER_REFLECT)
+        local_sq_mean = cv2.blur(pixels * pixels, (patch_size, patch_size), borderType=cv2.BORDER_REFLECT)
+        
+        if image.ndim == 3:
+            # Patches span all channels
+            local_mean = local_mean.mean(axis=2, keepdims=True)
+            local_sq_mean = local_sq_mean.mean(axis=2, keepdims=True)
+            
+        local_std = np.sqrt(np.maximum(local_sq_mean - local_mean * local_mean, 0))
+        noise_map = np.broadcast_to(local_std, image.shape).astype(np.float32)
                 
         # Normalize noise map
         noise_map = cv2.normalize(noise_map, None, 0, 1, cv2.NORM_MINMAX)
@@ -297,6 +300,14 @@ def normalize_image(image: np.ndarray, target_mean: float = 127, target_std: flo
         Normalized image array
     """
     try:
+        if image.dtype == np.uint8 and image.ndim == 2:
+            # Single-channel statistics in one pass, then fold shift, scale
+            # and clip into a lookup table so the image is traversed once
+            mean, std = (float(v[0, 0]) for v in cv2.meanStdDev(image))
+            levels = np.arange(256, dtype=np.float64)
+            lut = np.clip((levels - mean) * (target_std / std) + target_mean, 0, 255).astype(np.uint8)
+            return cv2.LUT(image, lut)
+        
         # Calculate current statistics
         mean = np.mean(image)
         std = np.std(image)
@@ -146,7 +146,9 @@ class RegionDetector:
                     x2 = min(width, x + w + margin)
                     y2 = min(height, y + h + margin)
                     
-                    region_img = image[y1:y2, x1:x2].copy()
+                    # Bounding-box view; regions are read-only downstream,
+                    # so there is no need to copy every candidate
+                    region_img = image[y1:y2, x1:x2]
                     
                     regions.append(TextRegion(
                         x=x1,
@@ -2,19 +2,34 @@
 VHS vision processing module using LM Studio with optimized preprocessing.
 """
 import base64
-import io
 import json
 import logging
+import random
+import re
+import threading
 import time
-from datetime import datetime
+from collections import OrderedDict
+from itertools import islice
+from concurrent.futures import ThreadPoolExecutor, as_completed, TimeoutError as FuturesTimeoutError
 from pathlib import Path
-from typing import Dict, Any, Optional, List, Tuple
+from typing import Dict, Any, Optional, List, Sequence, Tuple
 
 import cv2
 import numpy as np
 import requests
-from PIL import Image
+from requests.adapters import HTTPAdapter
 
+try:
+    from turbojpeg import TurboJPEG, TJPF_GRAY, TJSAMP_GRAY
+except ImportError:  # Optional SIMD JPEG encoder
+    TurboJPEG = None
+
+try:
+    import orjson
+except ImportError:  # Optional fast JSON for large image payloads
+    orjson = None
+
+from src.utils.debug_writer import DebugImageWriter
 from .preprocessing import (
     PreprocessingPipeline,
     TextRegion,
@@ -27,10 +42,40 @@ from .preprocessing import (
 
 logger = logging.getLogger(__name__)
 
+def _load_turbojpeg():
+    """Load libjpeg-turbo if available, otherwise fall back to cv2."""
+    if TurboJPEG is None:
+        return None
+    try:
+        return TurboJPEG()
+    except (OSError, RuntimeError) as e:
+        logger.debug(f"libjpeg-turbo unavailable, using cv2.imencode: {e}")
+        return None
+
+_turbojpeg = _load_turbojpeg()
+
+def _fields_format(categories: Sequence[str]) -> Dict[str, Any]:
+    """JSON schema response format asking for one string per category."""
+    return {
+        "type": "json_schema",
+        "json_schema": {
+            "name": "vhs_cover",
+            "schema": {
+                "type": "object",
+                "properties": {category: {"type": "string"} for category in categories},
+                "required": list(categories)
+            }
+        }
+    }
+
 class APIError(Exception):
     """Custom exception for API errors."""
     pass
 
+class APIRejectedError(APIError):
+    """The server refused the request itself (4xx or an error body)."""
+    pass
+
 class VHSVision:
     """Vision processing using LM Studio with optimized preprocessing."""
     
@@ -38,7 +83,67 @@ class VHSVision:
     MAX_RETRIES = 3
     INITIAL_TIMEOUT = (10, 30)  # (connect timeout, read timeout)
     MAX_BACKOFF = 15  # Maximum backoff time in seconds
+    RETRY_STATUS = frozenset({408, 429})  # Client errors worth retrying
     API_BASE_URL = "http://127.0.0.1:1234"
+    MAX_UPLOAD_DIM = 768  # Longest side of uploaded images
+    UPLOAD_DIMS = {"rating": 512}  # Smaller uploads for small badge-like fields
+    JPEG_QUALITY = 75
+    MAX_REGIONS = 3  # Top text regions sent to the model per extraction
+    MIN_REGION_SHARPNESS = 40.0  # Laplacian variance below which a region is blank
+    MIN_REGION_CONTRAST = 15.0  # Intensity std below which a region is blank
+    PREP_CACHE_SIZE = 2  # Images whose preprocessing is kept for reuse
+    REGION_STAGGER = 0.2  # Seconds between concurrent region requests
+    DEBUG_DIR = "debug_output"
+    DEBUG_QUEUE_SIZE = 64  # Pending debug image writes before new ones are dropped
+    
+    # Generation budget per category; answers are short, so cap decoding.
+    # Short fields keep slack for per-digit tokens or a leading space/quote;
+    # the newline stop sequence ends generation early anyway
+    MAX_TOKENS = {
+        "title": 32,
+        "year": 8,
+        "runtime": 8,
+        "studio": 16,
+        "director": 16,
+        "cast": 50,
+        "rating": 8
+    }
+    STOP_SEQUENCES = ["\n"]  # Every answer is a single line
+    
+    # Answers to short fields that are certainly complete and well-formed
+    _SHORT_PATTERNS = {
+        "year": re.compile(r"\d{4}"),
+        "rating": re.compile(r"G|PG|PG-13|R|NC-17")
+    }
+    YEAR_RANGE = (1950, 2025)  # Same plausible release years as ConfidenceScorer
+    
+    # Enhanced category-specific prompts with preprocessing context
+    PROMPTS = {
+        "title": "Extract movie title from this enhanced VHS cover image. Text has been preprocessed for optimal clarity. ONLY return the title text, nothing else.",
+        "year": "Find the release year from this enhanced VHS cover image. Text visibility has been optimized. ONLY return the 4-digit year, nothing else.",
+        "runtime": "Locate the runtime from this preprocessed VHS cover image. Text contrast has been enhanced. Return ONLY the number (e.g., if you see '116 minutes', return just '116').",
+        "studio": "Find the studio/production company from this enhanced VHS cover image. Text has been optimized for readability. ONLY return the studio name, nothing else.",
+        "director": "Extract the director name from this preprocessed VHS cover. Text clarity has been improved. Return ONLY the director's full name.",
+        "cast": "Find actor names from this enhanced VHS cover image. Text has been processed for better visibility. ONLY return comma-separated names, nothing else.",
+        "rating": "Locate the MPAA rating (G, PG, PG-13, R, or NC-17) on this preprocessed VHS cover. Text has been enhanced. Return ONLY the rating."
+    }
+    CATEGORIES = tuple(PROMPTS)
+    SYSTEM_PROMPT = "You are a VHS cover text extractor. Only return the exact text requested, nothing else."
+    OCR_SYSTEM_PROMPT = "You are a precise OCR system. Extract and return ONLY the visible text from the image. Do not add any interpretation or context. Only return what you can actually read."
+    OCR_PROMPT = "What text do you see in this image? ONLY return the text, nothing else."
+    
+    # System messages are identical across requests, so one dict is shared
+    _SYSTEM_MESSAGE = {"role": "system", "content": SYSTEM_PROMPT}
+    _OCR_SYSTEM_MESSAGE = {"role": "system", "content": OCR_SYSTEM_PROMPT}
+    
+    # Combined request used by extract_all
+    FIELDS_PROMPT = (
+        "Read this VHS cover. Return a JSON object with the keys {keys}. "
+        "Use the 4-digit release year, the runtime in minutes as a "
+        "number, the MPAA rating, and comma-separated cast names. Use an "
+        "empty string for anything not visible."
+    )
+    ALL_FIELDS_FORMAT = _fields_format(CATEGORIES)
     
     def __init__(self, model: str = "local-model", save_debug: bool = False):
         """
@@ -50,9 +155,32 @@ class VHSVision:
         """
         self.save_debug = save_debug
         self.pipeline = PreprocessingPipeline()
+        self.region_detector = RegionDetector()
         self.scorer = ConfidenceScorer()
         self.model = model
         self.preprocessing_images = {}
+        
+        # Keep-alive session so region requests reuse one socket to LM Studio;
+        # retries are handled with backoff in _make_api_request
+        self._session = requests.Session()
+        self._session.mount("http://", HTTPAdapter(pool_connections=2, pool_maxsize=8))
+        
+        # Region requests are I/O bound, so they are issued concurrently
+        self._executor = ThreadPoolExecutor(max_workers=self.MAX_REGIONS)
+        self._batch_regions = True  # Cleared if the model rejects multi-image requests
+        
+        # Preprocessing/region detection and region encodings, shared by
+        # the per-category calls made on the same image
+        self._prep_cache = OrderedDict()
+        self._region_urls: Dict[Tuple, str] = {}
+        
+        # Debug directory is created once rather than on every saved image,
+        # and images are written by a background thread off the extraction path
+        self._debug_dir: Optional[Path] = None
+        self._debug_writer: Optional[DebugImageWriter] = None
+        if save_debug:
+            self._start_debug_writer()
+        
         self._setup_lmstudio()
         
     def _setup_lmstudio(self):
@@ -97,7 +225,8 @@ class VHSVision:
         endpoint: str, 
         json_data: Optional[Dict] = None,
         timeout: Optional[Tuple[float, float]] = None,
-        max_retries: Optional[int] = None
+        max_retries: Optional[int] = None,
+        stop: Optional[threading.Event] = None
     ) -> Dict:
         """
         Make API request with retries and exponential backoff.
@@ -108,6 +237,7 @@ class VHSVision:
             json_data: Optional JSON payload
             timeout: Optional timeout tuple (connect, read)
             max_retries: Optional max retries override
+            stop: Optional event that abandons the request during backoff
             
         Returns:
             API response as dict
@@ -120,20 +250,45 @@ class VHSVision:
         max_retries = max_retries if max_retries is not None else self.MAX_RETRIES
         url = f"{self.API_BASE_URL}{endpoint}"
         
+        # Serialize the (image-heavy) payload once; retries resend the same bytes
+        body = headers = None
+        if json_data is not None:
+            if orjson is not None:
+                body = orjson.dumps(json_data)
+            else:
+                body = json.dumps(json_data).encode("utf-8")
+            headers = {"Content-Type": "application/json"}
+        
         for attempt in range(max_retries):
             try:
-                # Calculate exponential backoff delay
+                # Calculate exponential backoff delay, jittered so concurrent
+                # region requests do not retry in lockstep
                 if attempt > 0:
-                    delay = min(2 ** (attempt - 1), self.MAX_BACKOFF)
-                    time.sleep(delay)
+                    delay = min(
+                        2 ** (attempt - 1) * (1 + random.random() * 0.5),
+                        self.MAX_BACKOFF
+                    )
+                    if stop is None:
+                        time.sleep(delay)
+                    elif stop.wait(delay):
+                        raise APIError("API request cancelled")
                 
-                response = requests.request(
+                response = self._session.request(
                     method,
                     url,
-                    json=json_data,
+                    data=body,
+                    headers=headers,
                     timeout=timeout
                 )
+                # Other client errors will fail the same way on every retry
+                if (400 <= response.status_code < 500
+                        and response.status_code not in self.RETRY_STATUS):
+                    raise APIRejectedError(
+                        f"API request failed: {response.status_code} {response.reason}"
+                    )
                 response.raise_for_status()
+                if orjson is not None:
+                    return orjson.loads(response.content)
                 return response.json()
                 
             except requests.exceptions.Timeout:
@@ -146,6 +301,59 @@ class VHSVision:
                     raise APIError(f"API request failed: {str(e)}")
                 logger.warning(f"Attempt {attempt + 1} failed: {str(e)}, retrying...")
     
+    def close(self):
+        """Close pooled connections to LM Studio and stop region workers."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self._session.close()
+        if self._debug_writer is not None:
+            self._debug_writer.close()  # Stops once pending images are saved
+            self._debug_writer = None
+    
+    def _encode_image(self, image: np.ndarray, max_dim: Optional[int] = None) -> Optional[str]:
+        """
+        Downscale image to the model input size and encode as base64 JPEG.
+        
+        The model's vision token count grows with pixel count, so anything
+        larger only costs encode time, bandwidth and inference time.
+        
+        Args:
+            image: Image array
+            max_dim: Optional longest side override (defaults to MAX_UPLOAD_DIM)
+            
+        Returns:
+            Base64 encoded JPEG, or None if encoding fails
+        """
+        height, width = image.shape[:2]
+        scale = (max_dim or self.MAX_UPLOAD_DIM) / max(height, width)
+        if scale < 1.0:
+            image = cv2.resize(
+                image,
+                (max(1, int(width * scale)), max(1, int(height * scale))),
+                interpolation=cv2.INTER_AREA
+            )
+        
+        if _turbojpeg is not None:
+            image = np.ascontiguousarray(image)
+            if image.ndim == 2:
+                buffer = _turbojpeg.encode(
+                    image[:, :, np.newaxis],
+                    quality=self.JPEG_QUALITY,
+                    pixel_format=TJPF_GRAY,
+                    jpeg_subsample=TJSAMP_GRAY
+                )
+            else:
+                buffer = _turbojpeg.encode(image, quality=self.JPEG_QUALITY)
+        else:
+            success, buffer = cv2.imencode(
+                '.jpg', image, [int(cv2.IMWRITE_JPEG_QUALITY), self.JPEG_QUALITY]
+            )
+            if not success:
+                return None
+        
+        logger.debug(f"Encoded {image.shape[1]}x{image.shape[0]} upload: {len(buffer)} bytes JPEG")
+        # b64encode reads the encoder's buffer directly, without a bytes copy
+        return base64.b64encode(buffer).decode('ascii')
+    
     def extract_text(self, image: np.ndarray) -> Dict[str, Any]:
         """Extract text from image using basic OCR.
         
@@ -165,40 +373,21 @@ class VHSVision:
             # Store preprocessing images
             self.preprocessing_images = self.pipeline.intermediate_images
             
-            # Convert image to base64
-            success, buffer = cv2.imencode('.jpg', preprocessed)
-            if not success:
+            # Downscale and convert image to base64
+            image_base64 = self._encode_image(preprocessed)
+            if image_base64 is None:
                 return {"success": False, "error": "Failed to encode image"}
             
-            image_base64 = base64.b64encode(buffer).decode('utf-8')
-            
             # Make API request
             result = self._make_api_request(
                 "POST",
                 "/v1/chat/completions",
-                json_data={
-                    "model": self.model,
-                    "messages": [
-                        {
-                            "role": "system",
-                            "content": "You are a precise OCR system. Extract and return ONLY the visible text from the image. Do not add any interpretation or context. Only return what you can actually read."
-                        },
-                        {
-                            "role": "user",
-                            "content": [
-                                {"type": "text", "text": "What text do you see in this image? ONLY return the text, nothing else."},
-                                {
-                                    "type": "image_url",
-                                    "image_url": {
-                                        "url": f"data:image/jpeg;base64,{image_base64}"
-                                    }
-                                }
-                            ]
-                        }
-                    ],
-                    "temperature": 0.1,
-                    "max_tokens": 50
-                }
+                json_data=self._region_request(
+                    self.OCR_PROMPT,
+                    ["data:image/jpeg;base64," + image_base64],
+                    system_message=self._OCR_SYSTEM_MESSAGE,
+                    single_line=False
+                )
             )
             
             # Extract text
@@ -219,11 +408,254 @@ class VHSVision:
                 "error": str(e)
             }
 
+    def _image_key(self, image: np.ndarray) -> Tuple:
+        """Cheap identity key for an image: buffer, layout and a pixel sample."""
+        height, width = image.shape[:2]
+        sample = image[::max(1, height // 16), ::max(1, width // 16)]
+        return (image.ctypes.data, image.shape, image.strides, image.dtype.str,
+                hash(sample.tobytes()))
+    
+    def _detect_regions(self, image: np.ndarray) -> Tuple[np.ndarray, List[TextRegion]]:
+        """
+        Preprocess an image and pick its top text regions, reusing the result
+        when the same image is passed again (e.g. once per category).
+        
+        Args:
+            image: Image array
+            
+        Returns:
+            Tuple of (preprocessed image, top text regions, largest first)
+        """
+        key = self._image_key(image)
+        cached = self._prep_cache.get(key)
+        if cached is not None:
+            self._prep_cache.move_to_end(key)
+            preprocessed, regions, intermediate_images = cached
+            self.pipeline.intermediate_images = intermediate_images
+            return preprocessed, regions
+        
+        # Fresh dict so the cached intermediates are not overwritten in place
+        self.pipeline.intermediate_images = {}
+        preprocessed = self.pipeline.preprocess(image)
+        regions = self._top_regions(self.region_detector.detect(preprocessed))
+        
+        self._prep_cache[key] = (preprocessed, regions, self.pipeline.intermediate_images)
+        if len(self._prep_cache) > self.PREP_CACHE_SIZE:
+            _, (_, evicted, _) = self._prep_cache.popitem(last=False)
+            evicted_ids = {id(region) for region in evicted}
+            for encoded_key in [k for k in self._region_urls if k[0] in evicted_ids]:
+                del self._region_urls[encoded_key]
+        
+        return preprocessed, regions
+    
+    def _top_regions(self, regions: List[TextRegion]) -> List[TextRegion]:
+        """Pick the MAX_REGIONS largest regions that look like text, largest first."""
+        regions = sorted(regions, key=lambda r: r.width * r.height, reverse=True)
+        return list(islice(filter(self._region_has_text, regions), self.MAX_REGIONS))
+    
+    def _region_has_text(self, region: TextRegion) -> bool:
+        """
+        Cheap check that a region has the contrast and edges of text, so
+        blank or flat regions never cost an API round trip.
+        """
+        if region.image is None or region.image.size == 0:
+            return False
+        _, contrast = cv2.meanStdDev(region.image)
+        if contrast.max() <= self.MIN_REGION_CONTRAST:
+            return False
+        # 3x3 Laplacian of uint8 fits in int16
+        _, sharpness = cv2.meanStdDev(cv2.Laplacian(region.image, cv2.CV_16S, ksize=1))
+        return float(sharpness.max()) ** 2 > self.MIN_REGION_SHARPNESS
+    
+    def _encode_region(self, region: TextRegion, max_dim: Optional[int] = None) -> Optional[str]:
+        """
+        Encode a region image as a JPEG data URL.
+        
+        The URL is built once and reused across categories, so the base64
+        payload is not copied again for every request.
+        """
+        max_dim = max_dim or self.MAX_UPLOAD_DIM
+        image_url = self._region_urls.get((id(region), max_dim))
+        if image_url is None:
+            image_base64 = self._encode_image(region.image, max_dim)
+            if image_base64 is None:
+                return None
+            image_url = "data:image/jpeg;base64," + image_base64
+            self._region_urls[(id(region), max_dim)] = image_url
+        return image_url
+    
+    def _encode_regions(self, regions: List[TextRegion], max_dim: Optional[int] = None) -> List[str]:
+        """Encode all non-empty region images as data URLs, skipping failures."""
+        regions = [
+            region for region in regions
+            if region.image is not None and region.image.size > 0
+        ]
+        # cv2 and base64 release the GIL, so the regions encode in parallel
+        image_urls = self._executor.map(
+            lambda region: self._encode_region(region, max_dim), regions
+        )
+        return [url for url in image_urls if url is not None]
+    
+    def _encode_montage(self, regions: List[TextRegion], max_dim: Optional[int] = None) -> Optional[str]:
+        """
+        Stack region images vertically and encode them as one JPEG data URL.
+        
+        Used when the model rejects multi-image requests, so all candidates
+        still go out in one request with a single encode.
+        """
+        regions = [
+            region for region in regions
+            if region.image is not None and region.image.size > 0
+        ]
+        if not regions:
+            return None
+        
+        max_dim = max_dim or self.MAX_UPLOAD_DIM
+        key = (id(regions[0]), max_dim, len(regions))  # Evicted with the top region
+        image_url = self._region_urls.get(key)
+        if image_url is not None:
+            return image_url
+        
+        color = any(region.image.ndim == 3 for region in regions)
+        width = min(max_dim, max(region.image.shape[1] for region in regions))
+        rows = []
+        for region in regions:
+            image = region.image
+            if color and image.ndim == 2:
+                image = cv2.cvtColor(image, cv2.COLOR_GRAY2BGR)
+            height = max(1, round(image.shape[0] * width / image.shape[1]))
+            rows.append(cv2.resize(image, (width, height), interpolation=cv2.INTER_AREA))
+            # Mid-gray separator so the model sees distinct candidates
+            rows.append(np.full((8, width) + image.shape[2:], 128, dtype=image.dtype))
+        
+        image_base64 = self._encode_image(np.vstack(rows[:-1]), max_dim)
+        if image_base64 is None:
+            return None
+        image_url = "data:image/jpeg;base64," + image_base64
+        self._region_urls[key] = image_url
+        return image_url
+    
+    def _region_request(
+        self,
+        prompt: str,
+        image_urls: List[str],
+        max_tokens: int = 50,
+        system_message: Optional[Dict[str, str]] = None,
+        single_line: bool = True
+    ) -> Dict[str, Any]:
+        """
+        Build a chat completion payload for one or more region images.
+        
+        Only the user message is built per call; the system message and
+        stop sequences are shared constants.
+        
+        Args:
+            prompt: Prompt to use
+            image_urls: JPEG data URLs of the region images
+            max_tokens: Generation budget for the answer
+            system_message: System message (defaults to the extractor prompt)
+            single_line: Stop generation at the end of the first line
+            
+        Returns:
+            JSON payload for /v1/chat/completions
+        """
+        content = [{"type": "text", "text": prompt}]
+        content.extend(
+            {"type": "image_url", "image_url": {"url": image_url}}
+            for image_url in image_urls
+        )
+        payload = {
+            "model": self.model,
+            "messages": [
+                system_message or self._SYSTEM_MESSAGE,
+                {"role": "user", "content": content}
+            ],
+            "temperature": 0.1,
+            "max_tokens": max_tokens
+        }
+        if single_line:
+            payload["stop"] = self.STOP_SEQUENCES
+        return payload
+    
+    def _process_regions_batch(
+        self,
+        regions: List[TextRegion],
+        prompt: str,
+        timeout: Optional[Tuple[float, float]] = None,
+        max_dim: Optional[int] = None,
+        max_tokens: int = 50
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Process several regions in a single request.
+        
+        Regions are sent as separate images, or as one vertical montage once
+        the model has rejected multi-image input.
+        
+        Args:
+            regions: Text regions to process
+            prompt: Prompt to use
+            timeout: Optional timeout tuple (connect, read)
+            max_dim: Optional longest side for uploaded region images
+            max_tokens: Generation budget for the answer
+            
+        Returns:
+            Dict with the model's best answer if successful, None otherwise
+        """
+        multi_image = self._batch_regions
+        if multi_image:
+            image_urls = self._encode_regions(regions, max_dim)
+            prompt = f"{prompt} Consider each image; return the best single answer."
+        else:
+            montage_url = self._encode_montage(regions, max_dim)
+            image_urls = [montage_url] if montage_url else []
+            prompt = (f"{prompt} The image shows candidate text regions stacked "
+                      "vertically; return the best single answer.")
+        if not image_urls:
+            return None
+        
+        try:
+            result = self._make_api_request(
+                "POST",
+                "/v1/chat/completions",
+                json_data=self._region_request(prompt, image_urls, max_tokens),
+                timeout=timeout,
+                max_retries=1
+            )
+            if "error" in result:
+                raise APIRejectedError(f"Model error: {result['error']}")
+            
+            text = result["choices"][0]["message"]["content"].strip()
+            if not text or len(text) > 200:  # Basic validation
+                return None
+            
+            return {"text": text}
+            
+        except TimeoutError:
+            raise
+        except APIRejectedError as e:
+            if multi_image:
+                # Model rejects multi-image input; use montages from now on
+                logger.warning(f"Batched region request rejected, switching to montage: {e}")
+                self._batch_regions = False
+            else:
+                logger.warning(f"Montage region request rejected: {e}")
+            return None
+        except APIError as e:
+            # Network and server errors are transient; keep the current mode
+            logger.warning(f"Batched region request failed: {e}")
+            return None
+        except Exception as e:
+            logger.warning(f"Batched region request failed: {e}")
+            return None
+    
     def _process_region(
         self, 
         region: TextRegion, 
         prompt: str,
-        timeout: Optional[Tuple[float, float]] = None
+        timeout: Optional[Tuple[float, float]] = None,
+        max_dim: Optional[int] = None,
+        max_tokens: int = 50,
+        stop: Optional[threading.Event] = None
     ) -> Optional[Dict[str, Any]]:
         """
         Process a single region with retries and error handling.
@@ -231,6 +663,9 @@ class VHSVision:
         Args:
             region: Text region to process
             prompt: Prompt to use
+            max_dim: Optional longest side for the uploaded region image
+            max_tokens: Generation budget for the answer
+            stop: Optional event that cancels retries once another region wins
             
         Returns:
             Dict with text and confidence if successful, None otherwise
@@ -239,14 +674,12 @@ class VHSVision:
             return None
             
         try:
-            # Convert image to base64
-            success, buffer = cv2.imencode('.jpg', region.image)
-            if not success:
+            # Downscale and convert image to a base64 data URL
+            image_url = self._encode_region(region, max_dim)
+            if image_url is None:
                 logger.warning("Failed to encode region image")
                 return None
             
-            image_base64 = base64.b64encode(buffer).decode('utf-8')
-            
             # Calculate remaining time for timeout
             api_timeout = timeout or self.INITIAL_TIMEOUT
             
@@ -254,29 +687,8 @@ class VHSVision:
             result = self._make_api_request(
                 "POST",
                 "/v1/chat/completions",
-                json_data={
-                    "model": self.model,
-                    "messages": [
-                        {
-                            "role": "system",
-                            "content": "You are a VHS cover text extractor. Only return the exact text requested, nothing else."
-                        },
-                        {
-                            "role": "user",
-                            "content": [
-                                {"type": "text", "text": prompt},
-                                {
-                                    "type": "image_url",
-                                    "image_url": {
-                                        "url": f"data:image/jpeg;base64,{image_base64}"
-                                    }
-                                }
-                            ]
-                        }
-                    ],
-                    "temperature": 0.1,
-                    "max_tokens": 50
-                }
+                json_data=self._region_request(prompt, [image_url], max_tokens),
+                stop=stop
             )
             
             # Extract and validate text
@@ -296,6 +708,98 @@ class VHSVision:
             logger.error(f"Unexpected error processing region: {e}")
             return None
             
+    def _score_region(
+        self,
+        region: TextRegion,
+        prompt: str,
+        category: str,
+        timeout: Optional[Tuple[float, float]] = None,
+        stop: Optional[threading.Event] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Extract text from a region and score it for the category.
+        
+        Args:
+            region: Text region to process
+            prompt: Prompt to use
+            category: Category being extracted
+            timeout: Optional timeout tuple (connect, read)
+            stop: Optional event that cancels retries once another region wins
+            
+        Returns:
+            Scored result dict if the region produced text, None otherwise
+        """
+        result = self._process_region(
+            region, prompt, timeout=timeout,
+            max_dim=self.UPLOAD_DIMS.get(category),
+            max_tokens=self.MAX_TOKENS[category],
+            stop=stop
+        )
+        if not result:
+            return None
+        
+        # Basic confidence scoring
+        return {
+            "text": result["text"],
+            "confidence": self._score_text(result["text"], category),
+            "category": category,
+            "validated": True,
+            "source": "lmstudio"
+        }
+    
+    def _score_text(self, text: str, category: str) -> float:
+        """Score text, fully trusting exact matches for short fields."""
+        pattern = self._SHORT_PATTERNS.get(category)
+        if pattern is not None and pattern.fullmatch(text):
+            if category != "year" or self.YEAR_RANGE[0] <= int(text) <= self.YEAR_RANGE[1]:
+                return 100.0
+        return self.scorer.score_text(text, category)
+    
+    @staticmethod
+    def _empty_result(category: str, error: Optional[str] = None) -> Dict[str, Any]:
+        """Build an unvalidated result, optionally recording why extraction failed."""
+        result = {
+            "text": "",
+            "confidence": 0.0,
+            "category": category,
+            "validated": False
+        }
+        if error is not None:
+            result["error"] = error
+        return result
+    
+    @staticmethod
+    def _remaining_timeout(deadline: Optional[float]) -> Optional[Tuple[float, float]]:
+        """
+        Build a (connect, read) timeout from the time left before a deadline.
+        
+        Args:
+            deadline: time.monotonic() value to finish by, or None for no limit
+            
+        Returns:
+            Timeout tuple, or None when there is no deadline
+            
+        Raises:
+            TimeoutError: If the deadline has already passed
+        """
+        if deadline is None:
+            return None
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise TimeoutError("Extraction deadline exceeded")
+        return (min(2, remaining), remaining)
+    
+    def _staggered_score(
+        self,
+        delay: float,
+        stop: threading.Event,
+        *args
+    ) -> Optional[Dict[str, Any]]:
+        """Wait for the region's stagger slot, then score it unless stopped."""
+        if delay and stop.wait(delay):
+            return None
+        return self._score_region(*args, stop=stop)
+    
     def extract_info(
         self, 
         image: Optional[np.ndarray], 
@@ -314,22 +818,14 @@ class VHSVision:
             Dict containing extracted text, confidence and validation info
         """
         # Input validation
-        error_result = {
-            "text": "",
-            "confidence": 0.0,
-            "category": category,
-            "validated": False
-        }
-        
         if image is None or not isinstance(image, np.ndarray) or image.size == 0:
-            error_result["error"] = "Invalid image input"
-            return error_result
+            return self._empty_result(category, "Invalid image input")
             
-        if not isinstance(category, str) or category not in {
-            "title", "year", "runtime", "studio", "director", "cast", "rating"
-        }:
-            error_result["error"] = "Invalid category"
-            return error_result
+        if not isinstance(category, str) or category not in self.PROMPTS:
+            return self._empty_result(category, "Invalid category")
+        
+        # One budget for the whole call; later stages get what is left
+        deadline = time.monotonic() + timeout if timeout else None
             
         try:
             # Save original image for debug if enabled
@@ -337,113 +833,233 @@ class VHSVision:
                 self.save_debug_image(image, f"original_{category}")
             
             try:
-                # Initialize region detector if needed
-                if not hasattr(self, 'region_detector'):
-                    self.region_detector = RegionDetector()
-                
-                # Preprocess image
-                preprocessed = self.pipeline.preprocess(image)
-                
-                # Detect text regions
-                regions = self.region_detector.detect(preprocessed)
+                # Preprocess image and detect text regions
+                preprocessed, regions = self._detect_regions(image)
                 
             except Exception as e:
                 logger.error(f"Preprocessing failed: {e}")
-                error_result["error"] = f"Preprocessing error: {str(e)}"
-                return error_result
+                return self._empty_result(category, f"Preprocessing error: {str(e)}")
             
             if self.save_debug:
                 self.save_debug_image(preprocessed, f"preprocessed_{category}")
             
-            # Enhanced category-specific prompts with preprocessing context
-            base_prompts = {
-                "title": "Extract movie title from this enhanced VHS cover image. Text has been preprocessed for optimal clarity. ONLY return the title text, nothing else.",
-                "year": "Find the release year from this enhanced VHS cover image. Text visibility has been optimized. ONLY return the 4-digit year, nothing else.",
-                "runtime": "Locate the runtime from this preprocessed VHS cover image. Text contrast has been enhanced. Return ONLY the number (e.g., if you see '116 minutes', return just '116').",
-                "studio": "Find the studio/production company from this enhanced VHS cover image. Text has been optimized for readability. ONLY return the studio name, nothing else.",
-                "director": "Extract the director name from this preprocessed VHS cover. Text clarity has been improved. Return ONLY the director's full name.",
-                "cast": "Find actor names from this enhanced VHS cover image. Text has been processed for better visibility. ONLY return comma-separated names, nothing else.",
-                "rating": "Locate the MPAA rating (G, PG, PG-13, R, or NC-17) on this preprocessed VHS cover. Text has been enhanced. Return ONLY the rating."
-            }
-            
             if not regions:
-                error_result["error"] = "No text regions detected"
-                return error_result
+                return self._empty_result(category, "No text regions detected")
             
             # Process regions with enhanced confidence scoring
-            best_result = error_result.copy()
-            start_time = time.time()
+            best_result = self._empty_result(category)
             scored_results = []
             
             try:
-                for region in regions[:3]:  # Try top 3 regions
-                    # Check timeout
-                    if timeout and (time.time() - start_time) > timeout:
-                        raise TimeoutError(f"Region processing timed out after {timeout} seconds")
-                    
-                    # Build prompt with region-specific context
-                    prompt = base_prompts[category]
-                    
-                    result = self._process_region(
-                        region, 
-                        prompt,
-                        timeout=(2, timeout - (time.time() - start_time)) if timeout else None
+                prompt = self.PROMPTS[category]
+                
+                # Ask for the best answer across all regions in one request
+                if len(regions) > 1:
+                    result = self._process_regions_batch(
+                        regions, prompt, timeout=self._remaining_timeout(deadline),
+                        max_dim=self.UPLOAD_DIMS.get(category),
+                        max_tokens=self.MAX_TOKENS[category]
                     )
                     if result:
-                        # Basic confidence scoring
-                        confidence = self.scorer.score_text(result["text"], category)
-                        
-                        scored_results.append({
-                            "text": result["text"],
-                            "confidence": confidence,
-                            "category": category,
-                            "validated": True,
-                            "source": "lmstudio"
-                        })
-                        
-                        # Early exit on very high confidence
-                        if confidence >= 95:
-                            break
+                        return self._finish_extraction(
+                            {
+                                "text": result["text"],
+                                "confidence": self._score_text(result["text"], category),
+                                "category": category,
+                                "validated": True,
+                                "source": "lmstudio"
+                            },
+                            preprocessed,
+                            category
+                        )
+                
+                # Fall back to sending the regions concurrently, one per request
+                # Requests are staggered so one upload's vision encode overlaps
+                # the previous request's generation instead of contending
+                region_timeout = self._remaining_timeout(deadline)
+                remaining = region_timeout[1] if region_timeout else None
+                stop = threading.Event()
+                futures = {
+                    self._executor.submit(
+                        self._staggered_score, index * self.REGION_STAGGER, stop,
+                        region, prompt, category, region_timeout
+                    ): index
+                    for index, region in enumerate(regions)
+                }
                 
-                # Select best result from scored results
+                try:
+                    for future in as_completed(futures, timeout=remaining):
+                        result = future.result()
+                        if result:
+                            scored_results.append((futures[future], result))
+                            
+                            # Early exit on very high confidence
+                            if result["confidence"] >= 95:
+                                break
+                except FuturesTimeoutError:
+                    raise TimeoutError(f"Region processing timed out after {timeout} seconds")
+                finally:
+                    stop.set()
+                    for future in futures:
+                        future.cancel()
+                
+                # Select best result from scored results, preferring the
+                # higher-ranked region on ties
                 if scored_results:
-                    best_result = max(scored_results, key=lambda x: x["confidence"])
+                    best_result = max(
+                        scored_results, key=lambda x: (x[1]["confidence"], -x[0])
+                    )[1]
                 
             except TimeoutError as e:
                 logger.warning(f"Timeout during region processing: {e}")
                 raise
             
-            # Store preprocessing images and save for debug
-            self.preprocessing_images = self.pipeline.intermediate_images
-            if self.save_debug and best_result["validated"]:
-                self.save_debug_image(
-                    preprocessed,
-                    f"success_{category}_{best_result['confidence']:.0f}"
-                )
-            
-            return best_result
+            return self._finish_extraction(best_result, preprocessed, category)
             
         except Exception as e:
             logger.error(f"Extraction error ({category}): {str(e)}")
             if self.save_debug:
                 self.save_debug_image(image, f"error_{category}")
             
-            error_result["error"] = str(e)
-            return error_result
+            return self._empty_result(category, str(e))
+            
+    def extract_all(
+        self,
+        image: Optional[np.ndarray],
+        timeout: Optional[int] = None,
+        categories: Optional[Sequence[str]] = None
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Extract several categories from an image with a single model request.
+        
+        Preprocessing and region detection run once, and the top regions are
+        sent in one request asking for a JSON object with all categories.
+        Falls back to per-category extract_info calls if that fails.
+        
+        Args:
+            image: Image array or None
+            timeout: Optional timeout in seconds
+            categories: Categories to extract (defaults to all of them)
+            
+        Returns:
+            Dict mapping each category to an extract_info style result
+        """
+        if categories is None:
+            categories = self.CATEGORIES
+        
+        if image is None or not isinstance(image, np.ndarray) or image.size == 0:
+            return {
+                category: self._empty_result(category, "Invalid image input")
+                for category in categories
+            }
+        
+        results = {
+            category: self._empty_result(category, "Invalid category")
+            for category in categories
+            if not isinstance(category, str) or category not in self.PROMPTS
+        }
+        categories = list(dict.fromkeys(
+            category for category in categories if category not in results
+        ))
+        if not categories:
+            return results
+        
+        try:
+            preprocessed, regions = self._detect_regions(image)
+            
+            image_urls = self._encode_regions(regions)
+            if not image_urls:
+                raise APIError("No text regions detected")
+            
+            # The JSON answer may span several lines
+            payload = self._region_request(
+                self.FIELDS_PROMPT.format(keys=", ".join(categories)),
+                image_urls,
+                max_tokens=300,
+                single_line=False
+            )
+            if len(categories) == len(self.CATEGORIES):
+                payload["response_format"] = self.ALL_FIELDS_FORMAT
+            else:
+                payload["response_format"] = _fields_format(categories)
+            
+            result = self._make_api_request(
+                "POST",
+                "/v1/chat/completions",
+                json_data=payload,
+                timeout=(2, timeout) if timeout else None
+            )
+            fields = json.loads(result["choices"][0]["message"]["content"])
+            if not isinstance(fields, dict):
+                raise ValueError("Model did not return a JSON object")
             
-    def save_debug_image(self, image: Optional[np.ndarray], name: str, debug_dir: str = "debug_output"):
+        except Exception as e:
+            logger.warning(f"Combined extraction failed, extracting per category: {e}")
+            for category in categories:
+                results[category] = self.extract_info(image, category, timeout=timeout)
+            return results
+        
+        for category in categories:
+            text = str(fields.get(category) or "").strip()
+            if text and len(text) <= 200:
+                results[category] = {
+                    "text": text,
+                    "confidence": self._score_text(text, category),
+                    "category": category,
+                    "validated": True,
+                    "source": "lmstudio"
+                }
+            else:
+                results[category] = self._empty_result(category)
+        
+        self.preprocessing_images = self.pipeline.intermediate_images
+        return results
+    
+    def _finish_extraction(
+        self,
+        best_result: Dict[str, Any],
+        preprocessed: np.ndarray,
+        category: str
+    ) -> Dict[str, Any]:
+        """Store preprocessing images and save debug output for a result."""
+        self.preprocessing_images = self.pipeline.intermediate_images
+        if self.save_debug and best_result["validated"]:
+            self.save_debug_image(
+                preprocessed,
+                f"success_{category}_{best_result['confidence']:.0f}"
+            )
+        
+        return best_result
+    
+    def save_debug_image(self, image: Optional[np.ndarray], name: str, debug_dir: Optional[str] = None):
         """Save debug image."""
         if not self.save_debug or image is None:
             return
             
         try:
-            debug_path = Path(debug_dir)
-            debug_path.mkdir(exist_ok=True)
+            if self._debug_writer is None:  # Debug enabled after construction
+                self._start_debug_writer()
             
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            path = debug_path / f"{name}_{timestamp}.jpg"
+            if debug_dir is not None:
+                debug_path = Path(debug_dir)
+                debug_path.mkdir(exist_ok=True)
+            else:
+                debug_path = self._debug_dir
             
-            cv2.imwrite(str(path), image)
-            logger.debug(f"Saved debug image: {path}")
+            path = debug_path / f"{name}_{time.time_ns()}.jpg"
+            self._debug_writer.submit(str(path), image)
         except Exception as e:
             logger.error(f"Failed to save debug image: {e}")
+    
+    def _start_debug_writer(self):
+        """Create the debug directory and start the background image writer."""
+        self._debug_dir = Path(self.DEBUG_DIR)
+        self._debug_dir.mkdir(exist_ok=True)
+        self._debug_writer = DebugImageWriter(
+            max_pending=self.DEBUG_QUEUE_SIZE, name="vhs-debug-writer"
+        )
+    
+    def flush_debug_images(self):
+        """Block until every queued debug image has been written."""
+        if self._debug_writer is not None:
+            self._debug_writer.flush()
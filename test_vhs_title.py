@@ -2,6 +2,8 @@
 Tests for VHS title extraction preprocessing components.
 """
 import os
+import shutil
+import socket
 import pytest
 import cv2
 import numpy as np
@@ -13,20 +15,39 @@ from src.vision.vhs_vision import VHSVision
 
 logger = logging.getLogger(__name__)
 
-@pytest.fixture
+def _lmstudio_up():
+    """Check the LM Studio port with a raw TCP connect instead of an HTTP round trip."""
+    try:
+        socket.create_connection(("127.0.0.1", 1234), timeout=0.2).close()
+        return True
+    except OSError:
+        return False
+
+# Extraction tests need a running LM Studio server; opt in with LMSTUDIO_TESTS=1.
+# The marker is evaluated once at import, so the server is probed once per run.
+requires_lmstudio = pytest.mark.skipif(
+    not (os.getenv("LMSTUDIO_TESTS") and _lmstudio_up()),
+    reason="LM Studio API integration not being tested or server not running"
+)
+
+@pytest.fixture(scope="session")
 def vision():
-    """Initialize VHSVision with debug enabled."""
-    return VHSVision(save_debug=True)
+    """Initialize VHSVision with debug enabled, once for all tests."""
+    vision = VHSVision(save_debug=True)
+    yield vision
+    vision.close()
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def test_image():
-    """Load test VHS cover image."""
+    """Load test VHS cover image once; read-only since every test shares it."""
     test_path = "testvhs3.jpg"
     if not os.path.exists(test_path):
         pytest.skip("Test image not found")
-    return cv2.imread(test_path)
+    image = cv2.imread(test_path)
+    image.setflags(write=False)
+    return image
 
-@pytest.mark.skip(reason="LM Studio API integration not being tested")
+@requires_lmstudio
 def test_title_extraction(vision, test_image):
     """Test title extraction with optimized preprocessing."""
     result = vision.extract_info(test_image, "title")
@@ -42,7 +63,7 @@ def test_title_extraction(vision, test_image):
     assert result["confidence"] > 60, "Title confidence should be reasonable"
     assert result["validated"], "Result should be validated"
 
-@pytest.mark.skip(reason="LM Studio API integration not being tested")
+@requires_lmstudio
 def test_year_extraction(vision, test_image):
     """Test year extraction with optimized preprocessing."""
     result = vision.extract_info(test_image, "year")
@@ -58,7 +79,7 @@ def test_year_extraction(vision, test_image):
         assert 1970 <= int(year) <= 2006, "Year should be in VHS era"
         assert result["confidence"] > 50, "Year confidence should be reasonable"
 
-@pytest.mark.skip(reason="LM Studio API integration not being tested")
+@requires_lmstudio
 def test_rating_extraction(vision, test_image):
     """Test rating extraction with optimized preprocessing."""
     result = vision.extract_info(test_image, "rating")
@@ -72,7 +93,7 @@ def test_rating_extraction(vision, test_image):
         assert rating in valid_ratings, f"Rating {rating} should be valid MPAA rating"
         assert result["confidence"] > 50, "Rating confidence should be reasonable"
 
-@pytest.mark.skip(reason="LM Studio API integration not being tested")
+@requires_lmstudio
 def test_runtime_extraction(vision, test_image):
     """Test runtime extraction with optimized preprocessing."""
     result = vision.extract_info(test_image, "runtime")
@@ -111,13 +132,14 @@ def test_preprocessing_output(vision, test_image):
 def test_debug_output(vision, test_image):
     """Test debug image output."""
     debug_dir = Path("debug_output")
-    if debug_dir.exists():
-        for f in debug_dir.glob("*"):
-            f.unlink()
+    # Start from an empty directory; the vision fixture created it already
+    shutil.rmtree(debug_dir, ignore_errors=True)
+    debug_dir.mkdir()
     
     # Process image with debug enabled
     preprocessed, regions = vision.pipeline.preprocess(test_image)
     vision.save_debug_image(preprocessed, "test_preprocessing")
+    vision.flush_debug_images()  # Debug images are written in the background
     
     # Check debug images were saved
     assert debug_dir.exists()
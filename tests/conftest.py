@@ -1,12 +1,22 @@
 """
 Test configuration and shared fixtures.
 """
+import os
 import pytest
 import numpy as np
 from unittest.mock import Mock
+
+# Tests never show windows; skip probing for a display server unless the
+# environment asks for a specific platform plugin
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
 from PyQt6.QtWidgets import QApplication
 from PyQt6.QtGui import QPixmap
 
+# Allocated once; read-only so no test can leak changes into another
+_MOCK_PREPROCESSED_IMAGE = np.zeros((100, 100, 3), dtype=np.uint8)
+_MOCK_PREPROCESSED_IMAGE.flags.writeable = False
+
 @pytest.fixture(scope="session")
 def qapp():
     """Create QApplication instance."""
@@ -91,5 +101,5 @@ def mock_qpixmap():
 
 @pytest.fixture
 def mock_preprocessed_image():
-    """Create mock preprocessed image as numpy array."""
-    return np.zeros((100, 100, 3), dtype=np.uint8)
+    """Mock preprocessed image as numpy array (shared and read-only)."""
+    return _MOCK_PREPROCESSED_IMAGE
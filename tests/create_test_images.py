@@ -3,8 +3,18 @@ Create test images for integration tests.
 """
 from PIL import Image, ImageDraw, ImageFont
 import os
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
 
+@lru_cache(maxsize=None)
+def load_font(size: int = 32):
+    """Load Arial once per size, falling back to the default font."""
+    try:
+        return ImageFont.truetype("arial.ttf", size)
+    except IOError:
+        return ImageFont.load_default()
+
 def create_text_image(filename: str, text: str, size=(800, 600), bg_color="white", text_color="black"):
     """Create an image with text."""
     # Create image
@@ -12,10 +22,7 @@ def create_text_image(filename: str, text: str, size=(800, 600), bg_color="white
     draw = ImageDraw.Draw(img)
     
     # Try to use Arial font, fall back to default if not available
-    try:
-        font = ImageFont.truetype("arial.ttf", 32)
-    except IOError:
-        font = ImageFont.load_default()
+    font = load_font(32)
     
     # Calculate text position to center it
     text_bbox = draw.textbbox((0, 0), text, font=font)
@@ -38,19 +45,16 @@ def main():
     test_dir = Path("test_images")
     test_dir.mkdir(exist_ok=True)
     
-    # Create movie test image
-    create_text_image(
-        test_dir / "test_vhs_cover.jpg",
-        "Back to the Future (1985)",
-        (800, 1200)
-    )
-    
-    # Create audio test image
-    create_text_image(
-        test_dir / "test_audio_cover.jpg",
-        "Pink Floyd - The Wall",
-        (800, 800)
-    )
+    specs = [
+        # Movie test image
+        (test_dir / "test_vhs_cover.jpg", "Back to the Future (1985)", (800, 1200)),
+        # Audio test image
+        (test_dir / "test_audio_cover.jpg", "Pink Floyd - The Wall", (800, 800)),
+    ]
+    
+    # PIL releases the GIL while rasterizing and encoding, so threads overlap
+    with ThreadPoolExecutor() as executor:
+        list(executor.map(lambda spec: create_text_image(*spec), specs))
     
     # Create blank test image
     Image.new('RGB', (100, 100), 'white').save(test_dir / "blank.jpg")
@@ -2,6 +2,8 @@
 Mock objects and utilities for testing.
 """
 import time
+from functools import lru_cache
+
 import numpy as np
 import cv2
 
@@ -18,6 +20,12 @@ def create_test_image(width: int = 640, height: int = 480) -> np.ndarray:
     Returns:
         NumPy array representing the test image
     """
+    # Callers get their own copy since the pipelines may write in place
+    return _build_test_image(width, height).copy()
+
+@lru_cache(maxsize=8)
+def _build_test_image(width: int, height: int) -> np.ndarray:
+    """Render the synthetic test image once per size; the result is read-only."""
     # Create blank image
     image = np.full((height, width), 255, dtype=np.uint8)
     
@@ -53,9 +61,12 @@ def create_test_image(width: int = 640, height: int = 480) -> np.ndarray:
     )
     
     # Add some noise and blur to simulate real conditions
-    noise = np.random.normal(0, 10, image.shape).astype(np.uint8)
+    # Seeded from the size so each size always gets the same pixels
+    rng = np.random.default_rng((width, height))
+    noise = rng.integers(0, 21, size=image.shape, dtype=np.uint8)
     image = cv2.add(image, noise)
     image = cv2.GaussianBlur(image, (3, 3), 0)
+    image.flags.writeable = False
     
     return image
 
@@ -158,18 +169,21 @@ class PreprocessorWithTimeout(MockPreprocessor):
         """Initialize mock with delay settings."""
         super().__init__(*args, **kwargs)
         self.processing_delay = kwargs.get('processing_delay', 1)  # Seconds per stage
+        # Injectable so tests can simulate elapsed time without sleeping;
+        # a fake sleep should advance the fake clock
+        self.clock = kwargs.get('clock', time.monotonic)
+        self.sleep = kwargs.get('sleep', time.sleep)
         
     def preprocess(self, image, progress_callback=None, timeout=None):
         """Simulate preprocessing with delay."""
-        start_time = time.time()
+        start_time = self.clock()
         
         # Update progress for early stages
         if progress_callback:
             stages = ["grayscale", "resize", "enhance", "denoise"]
             for stage in stages:
                 progress_callback(stage, 0.0)
-                time.sleep(0.1)  # Small delay
-                if timeout and (time.time() - start_time) > timeout:
+                if timeout and (self.clock() - start_time) > timeout:
                     # Show partial progress for current stage
                     progress_callback(stage, 0.5)
                     raise TimeoutError(f"Preprocessing timed out after {timeout} seconds")
@@ -180,10 +194,10 @@ class PreprocessorWithTimeout(MockPreprocessor):
             
         # Simulate main processing time
         if self.processing_delay:
-            time.sleep(self.processing_delay)
+            self.sleep(self.processing_delay)
             
         # Check for timeout after delay
-        if timeout and (time.time() - start_time) > timeout:
+        if timeout and (self.clock() - start_time) > timeout:
             if progress_callback:
                 progress_callback("text", 0.5)  # Show text as partially complete
             raise TimeoutError(f"Preprocessing timed out after {timeout} seconds")
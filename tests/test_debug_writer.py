@@ -0,0 +1,35 @@
+"""
+Unit tests for the background debug image writer.
+"""
+import cv2
+import numpy as np
+import pytest
+
+from src.utils.debug_writer import DebugImageWriter
+
+@pytest.mark.unit
+def test_writes_snapshot_on_flush(tmp_path):
+    """Test queued images are on disk after flush, as they were when queued."""
+    writer = DebugImageWriter()
+    image = np.full((20, 20), 200, dtype=np.uint8)
+    path = tmp_path / "debug.png"
+
+    assert writer.submit(str(path), image)
+    image[:] = 0  # Caller reuses its buffer right away
+    writer.flush()
+
+    assert cv2.imread(str(path), cv2.IMREAD_GRAYSCALE).min() == 200
+    writer.close()
+
+@pytest.mark.unit
+def test_umat_and_closed_writer(tmp_path):
+    """Test UMat input is accepted and a closed writer drops new images."""
+    writer = DebugImageWriter()
+    path = tmp_path / "umat.png"
+
+    assert writer.submit(str(path), cv2.UMat(np.zeros((10, 10), dtype=np.uint8)))
+    writer.flush()
+    writer.close()
+
+    assert path.exists()
+    assert not writer.submit(str(tmp_path / "late.png"), np.zeros((10, 10), dtype=np.uint8))
@@ -107,6 +107,30 @@ def test_preprocess_image(vision, sample_image):
     # Check if image is not empty
     assert np.any(processed != 0)
 
+def test_is_clean(vision):
+    """Test clean-image fast path predicate."""
+    # Random noise is both sharp and high contrast
+    rng = np.random.default_rng(0)
+    gray = rng.integers(0, 255, (480, 640), dtype=np.uint8)
+    assert vision._is_clean(gray)
+    
+    # Flat image has no edges and no contrast
+    flat = np.full((480, 640), 128, dtype=np.uint8)
+    assert not vision._is_clean(flat)
+
+def test_preprocess_image_umat(vision, sample_image):
+    """Test the OpenCL (UMat) preprocessing path, which needs no device to run."""
+    vision._use_umat = True
+    processed = vision.preprocess_image(sample_image)
+    
+    assert isinstance(processed, np.ndarray)
+    assert processed.ndim == 3
+    
+    rng = np.random.default_rng(0)
+    gray = rng.integers(0, 255, (480, 640), dtype=np.uint8)
+    assert vision._is_clean(cv2.UMat(gray))
+    assert not vision._is_clean(cv2.UMat(np.full((480, 640), 128, dtype=np.uint8)))
+
 def test_encode_image(vision, sample_image):
     """Test image encoding with adaptive quality."""
     encoded = vision.encode_image(sample_image)
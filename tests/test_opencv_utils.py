@@ -46,6 +46,16 @@ def test_load_image_success(tmp_path):
     assert loaded is not None
     assert loaded.shape == (10, 10, 3)
 
+@pytest.mark.unit
+def test_load_image_grayscale(tmp_path):
+    """Test loading an image directly as grayscale."""
+    image_path = tmp_path / "test.jpg"
+    cv2.imwrite(str(image_path), np.zeros((10, 10, 3), dtype=np.uint8))
+    
+    loaded = opencv_utils.load_image(str(image_path), grayscale=True)
+    assert loaded is not None
+    assert loaded.shape == (10, 10)
+
 @pytest.mark.unit
 def test_load_image_nonexistent():
     """Test loading a non-existent image file."""
@@ -163,6 +173,16 @@ def test_normalize_image(sample_image):
     assert abs(np.mean(normalized) - 127) < 1.0  # Allow small deviation
     assert abs(np.std(normalized) - 50) < 1.0
 
+@pytest.mark.unit
+def test_normalize_image_color(sample_image):
+    """Test color images are normalized with statistics over all channels."""
+    image = sample_image.copy()
+    image[..., 0] //= 2  # Make the channels differ
+    normalized = opencv_utils.normalize_image(image, target_mean=127, target_std=50)
+    
+    expected = np.clip((image - image.mean()) * (50 / image.std()) + 127, 0, 255).astype(np.uint8)
+    assert np.array_equal(normalized, expected)
+
 @pytest.mark.unit
 def test_extract_text_regions(sample_image):
     """Test text region extraction."""
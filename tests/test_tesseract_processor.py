@@ -0,0 +1,100 @@
+"""
+Unit tests for the Tesseract OCR processor.
+"""
+import cv2
+import numpy as np
+from unittest.mock import Mock, patch
+import pytest
+
+pytest.importorskip("pyzbar.pyzbar")  # BarcodeScanner needs the zbar library
+
+from src.vision import tesseract_processor
+from src.vision.tesseract_processor import VisionProcessor
+
+@pytest.fixture
+def processor(tmp_path):
+    """Create a processor on the tesseract CLI path with barcode scanning mocked."""
+    with patch.object(tesseract_processor, '_load_tesserocr', return_value=None), \
+         patch.object(tesseract_processor, 'BarcodeScanner'):
+        proc = VisionProcessor(debug_output_dir=str(tmp_path))
+    yield proc
+    proc.close()
+
+@pytest.fixture
+def text_image():
+    """Create a dark-on-light image with some text."""
+    image = np.full((120, 400), 255, dtype=np.uint8)
+    cv2.putText(image, "MOVIE TITLE", (10, 80), cv2.FONT_HERSHEY_SIMPLEX, 1.5, 0, 3)
+    return image
+
+def test_confident_first_pass_skips_variants(processor, text_image):
+    """Test a confident, long enough first pass is returned without retries."""
+    with patch.object(processor, '_run_tesseract_cli',
+                      return_value=[("MOVIE", 90.0), ("TITLE", 90.0)]) as mock_ocr:
+        text, conf = processor._extract_roi_text(text_image, (0, 0, 1, 1), "title")
+
+    assert (text, conf) == ("MOVIE TITLE", 90.0)
+    assert mock_ocr.call_count == 1
+
+def test_blank_roi_skips_variants(processor):
+    """Test an empty first pass on a flat ROI is not retried."""
+    blank = np.full((120, 400), 255, dtype=np.uint8)
+    with patch.object(processor, '_run_tesseract_cli', return_value=[]) as mock_ocr:
+        result = processor._extract_roi_text(blank, (0, 0, 1, 1), "title")
+
+    assert result == ("", 0.0)
+    assert mock_ocr.call_count == 1
+
+def test_retry_uses_dilated_and_eroded_variants_only(processor, text_image):
+    """Test a weak first pass is retried on two variants, none inverted."""
+    with patch.object(processor, '_run_tesseract_cli',
+                      return_value=[("MOV", 30.0)]) as mock_ocr:
+        processor._extract_roi_text(text_image, (0, 0, 1, 1), "title")
+
+    assert mock_ocr.call_count == 3  # Original, dilated, eroded
+    for call in mock_ocr.call_args_list:
+        assert cv2.mean(call.args[0])[0] >= 127  # Still dark text on light
+
+def test_ocr_cache_hit_skips_tesseract(processor, text_image):
+    """Test OCR of an identical image and config reuses the cached words."""
+    config = processor.ocr_configs["title"]
+    with patch.object(processor, '_run_tesseract_cli',
+                      return_value=[("MOVIE", 80.0)]) as mock_ocr:
+        first = processor._ocr_only(text_image, config)
+        second = processor._ocr_only(text_image.copy(), config)
+
+    assert first == second
+    assert mock_ocr.call_count == 1
+
+def test_tesseract_cli_limits_openmp_threads(processor, text_image):
+    """Test the CLI path parses TSV output and limits only the subprocess."""
+    tsv = (b"level\tpage_num\tblock_num\tpar_num\tline_num\tword_num\t"
+           b"left\ttop\twidth\theight\tconf\ttext\n"
+           b"5\t1\t1\t1\t1\t1\t0\t0\t10\t10\t91\t1985\n")
+    with patch.object(tesseract_processor.subprocess, 'run',
+                      return_value=Mock(stdout=tsv)) as mock_run, \
+         patch.dict(tesseract_processor.os.environ, clear=False) as environ:
+        environ.pop("OMP_THREAD_LIMIT", None)
+        words = processor._run_tesseract(text_image, processor.ocr_configs["year"])
+        assert "OMP_THREAD_LIMIT" not in environ
+
+    assert words == [("1985", 91.0)]
+    assert mock_run.call_args.kwargs["env"]["OMP_THREAD_LIMIT"] == "1"
+
+@pytest.mark.parametrize("longest,expected", [
+    (900, cv2.IMREAD_REDUCED_COLOR_8),
+    (450, cv2.IMREAD_REDUCED_COLOR_4),
+    (250, cv2.IMREAD_REDUCED_COLOR_2),
+    (150, cv2.IMREAD_COLOR),
+])
+def test_imread_flags_picks_reduced_decode(processor, tmp_path, longest, expected):
+    """Test the largest reduction that stays above max_image_dim is chosen."""
+    processor.max_image_dim = 100
+    path = tmp_path / "cover.jpg"
+    cv2.imwrite(str(path), np.zeros((longest // 2, longest, 3), dtype=np.uint8))
+
+    assert processor._imread_flags(str(path)) == expected
+
+def test_imread_flags_unreadable_file(processor, tmp_path):
+    """Test files PIL cannot open fall back to a full decode."""
+    assert processor._imread_flags(str(tmp_path / "missing.jpg")) == cv2.IMREAD_COLOR
@@ -19,8 +19,13 @@ def test_preprocessing_timeout():
     """Test timeout during preprocessing operations."""
     from tests.mocks import PreprocessorWithTimeout
     
-    # Create pipeline with significant delay
-    pipeline = PreprocessorWithTimeout(processing_delay=2)
+    # Create pipeline with significant delay, simulated on a fake clock
+    now = [0.0]
+    def sleep(seconds):
+        now[0] += seconds
+    pipeline = PreprocessorWithTimeout(
+        processing_delay=2, clock=lambda: now[0], sleep=sleep
+    )
     image = create_test_image()
     
     # Process with timeout shorter than delay
@@ -30,6 +35,27 @@ def test_preprocessing_timeout():
             timeout=1  # 1s timeout vs 2s delay
         )
 
+def test_preprocessing_stage_timeout():
+    """Test a timeout between stages reports the interrupted stage."""
+    from tests.mocks import PreprocessorWithTimeout
+    
+    # Start, grayscale check, then resize check after 1.5s have passed
+    clock = iter([0.0, 0.5, 1.5]).__next__
+    pipeline = PreprocessorWithTimeout(processing_delay=0, clock=clock)
+    
+    updates = []
+    with pytest.raises(TimeoutError):
+        pipeline.preprocess(
+            create_test_image(),
+            progress_callback=lambda stage, progress: updates.append((stage, progress)),
+            timeout=1
+        )
+    
+    assert updates == [
+        ("grayscale", 0.0), ("grayscale", 1.0),
+        ("resize", 0.0), ("resize", 0.5)
+    ]
+
 def test_preprocessing_progress_tracking():
     """Test progress callback during preprocessing."""
     pipeline = PreprocessingPipeline()
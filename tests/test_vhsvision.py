@@ -6,7 +6,7 @@ import numpy as np
 import cv2
 from unittest.mock import Mock, patch, ANY
 
-from src.vision.vhs_vision import VHSVision, APIError
+from src.vision.vhs_vision import VHSVision, APIError, APIRejectedError
 
 @pytest.fixture
 def mock_api_response():
@@ -143,3 +143,125 @@ def test_timeout_handling(mock_preprocessor, vhs_vision):
         assert result["validated"] is False
         assert "error" in result
         assert "Processing timed out" in result["error"]  # Match exact error message
+
+def test_encode_image_downscales_to_model_input(vhs_vision):
+    """Test large images are downscaled before upload."""
+    import base64
+    image = np.zeros((3000, 2000, 3), dtype=np.uint8)
+    
+    encoded = vhs_vision._encode_image(image)
+    decoded = cv2.imdecode(np.frombuffer(base64.b64decode(encoded), np.uint8), cv2.IMREAD_UNCHANGED)
+    
+    assert max(decoded.shape[:2]) == VHSVision.MAX_UPLOAD_DIM
+    assert decoded.shape[0] > decoded.shape[1]  # Aspect ratio preserved
+
+def test_extract_all_single_request(vhs_vision):
+    """Test all categories are extracted from one combined request."""
+    import json
+    from src.vision.preprocessing import TextRegion
+    vhs_vision.region_detector = Mock()
+    vhs_vision.region_detector.detect.return_value = [
+        TextRegion(x=0, y=0, width=50, height=20,
+                   image=np.tile(np.array([0, 255], dtype=np.uint8), (20, 25)))
+    ]
+    fields = {category: "" for category in VHSVision.CATEGORIES}
+    fields.update(title="Test Movie Title", year="1985")
+    response = {"choices": [{"message": {"content": json.dumps(fields)}}]}
+    image = np.zeros((200, 200), dtype=np.uint8)
+    
+    with patch.object(vhs_vision, '_make_api_request', return_value=response) as mock_api:
+        results = vhs_vision.extract_all(image)
+    
+    assert mock_api.call_count == 1
+    assert set(results) == set(VHSVision.CATEGORIES)
+    assert results["title"]["text"] == "Test Movie Title"
+    assert results["year"]["validated"] is True
+    assert results["rating"]["validated"] is False
+
+def test_preprocessing_reused_across_categories(mock_preprocessor, vhs_vision):
+    """Test repeated calls on the same image preprocess it only once."""
+    image = np.zeros((200, 200), dtype=np.uint8)
+    
+    vhs_vision.extract_info(image, "title")
+    vhs_vision.extract_info(image, "year")
+    
+    assert mock_preprocessor.preprocess.call_count == 1
+
+def test_short_answers_accepted_on_exact_match(vhs_vision):
+    """Test well-formed year and rating answers skip the scorer."""
+    assert vhs_vision._score_text("1985", "year") == 100.0
+    assert vhs_vision._score_text("2099", "year") == 75.0  # Out of range goes to the scorer
+    assert vhs_vision._score_text("0000", "year") == 75.0
+    assert vhs_vision._score_text("PG-13", "rating") == 100.0
+    assert vhs_vision._score_text("PG-1985", "rating") == 75.0
+    assert vhs_vision._score_text("1985", "runtime") == 75.0
+
+def test_blank_regions_skipped(vhs_vision):
+    """Test flat regions are dropped before any API call."""
+    from src.vision.preprocessing import TextRegion
+    text = TextRegion(x=0, y=0, width=50, height=20,
+                      image=np.tile(np.array([0, 255], dtype=np.uint8), (20, 25)))
+    blank = TextRegion(x=0, y=30, width=100, height=40,
+                       image=np.full((40, 100), 200, dtype=np.uint8))
+    
+    assert vhs_vision._top_regions([text, blank]) == [text]
+
+def test_extract_all_requested_categories(vhs_vision):
+    """Test extract_all asks only for the requested categories."""
+    import json
+    from src.vision.preprocessing import TextRegion
+    vhs_vision.region_detector = Mock()
+    vhs_vision.region_detector.detect.return_value = [
+        TextRegion(x=0, y=0, width=50, height=20,
+                   image=np.tile(np.array([0, 255], dtype=np.uint8), (20, 25)))
+    ]
+    response = {"choices": [{"message": {"content": json.dumps({"title": "Test Movie Title", "year": "1985"})}}]}
+    image = np.zeros((200, 200), dtype=np.uint8)
+    
+    with patch.object(vhs_vision, '_make_api_request', return_value=response) as mock_api:
+        results = vhs_vision.extract_all(image, categories=["title", "year", "genre"])
+    
+    schema = mock_api.call_args[1]["json_data"]["response_format"]["json_schema"]["schema"]
+    assert schema["required"] == ["title", "year"]
+    assert set(results) == {"title", "year", "genre"}
+    assert results["year"]["confidence"] == 100.0
+    assert results["genre"]["error"] == "Invalid category"
+
+def test_batching_kept_on_transient_errors(vhs_vision):
+    """Test only a rejected multi-image request switches to montages."""
+    from src.vision.preprocessing import TextRegion
+    regions = [
+        TextRegion(x=0, y=0, width=50, height=20,
+                   image=np.tile(np.array([0, 255], dtype=np.uint8), (20, 25)))
+    ] * 2
+    
+    with patch.object(vhs_vision, '_make_api_request', side_effect=APIError("Connection refused")):
+        assert vhs_vision._process_regions_batch(regions, "prompt") is None
+    assert vhs_vision._batch_regions is True
+    
+    with patch.object(vhs_vision, '_make_api_request', side_effect=APIRejectedError("400 Bad Request")):
+        assert vhs_vision._process_regions_batch(regions, "prompt") is None
+    assert vhs_vision._batch_regions is False
+
+def test_extract_info_shares_one_timeout_budget(vhs_vision):
+    """Test the per-region fallback only gets the time the batch left over."""
+    import time
+    from src.vision.preprocessing import TextRegion
+    vhs_vision.region_detector = Mock()
+    vhs_vision.region_detector.detect.return_value = [
+        TextRegion(x=0, y=0, width=50, height=20,
+                   image=np.tile(np.array([0, 255], dtype=np.uint8), (20, 25)))
+    ] * 2
+    image = np.zeros((200, 200), dtype=np.uint8)
+    
+    def slow_batch(*args, **kwargs):
+        time.sleep(0.3)
+        return None
+    
+    with patch.object(vhs_vision, '_process_regions_batch', side_effect=slow_batch), \
+         patch.object(vhs_vision, '_process_region') as mock_region:
+        result = vhs_vision.extract_info(image, "title", timeout=0.2)
+    
+    assert mock_region.call_count == 0
+    assert result["validated"] is False
+    assert "deadline" in result["error"]